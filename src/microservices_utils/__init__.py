@@ -4,11 +4,38 @@ Microservices Utils Package
 A reusable package for microservices utilities including response handling, logging, JWT management, and messages.
 """
 
-from .messages import Messages, GeneralMessages
-from .response_handler import ResponseHandler
-from .logger import Logger
-from .jwt_utils import JwtHandler
+import importlib
 
-__all__ = ["Messages", "GeneralMessages", "ResponseHandler", "Logger", "JwtHandler"]
+# Public name -> submodule defining it. Submodules are imported on first access
+# (PEP 562), so importing e.g. Messages does not pull in jose/fastapi.
+_LAZY_IMPORTS = {
+    "Messages": ".messages",
+    "GeneralMessages": ".messages",
+    "get_by_code": ".messages",
+    "ResponseHandler": ".response_handler",
+    "Logger": ".logger",
+    "JwtHandler": ".jwt_utils",
+}
 
-__all__ = ["Messages", "GeneralMessages", "ResponseHandler", "Logger", "JwtHandler"]
+__all__ = [
+    "Messages",
+    "GeneralMessages",
+    "get_by_code",
+    "ResponseHandler",
+    "Logger",
+    "JwtHandler",
+]
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Cache on the package so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
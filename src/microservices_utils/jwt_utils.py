@@ -1,62 +1,147 @@
-from datetime import datetime, timedelta, timezone
+from datetime import timedelta
 from typing import Optional
-from jose import JWTError, jwt
+from cachetools import TTLCache
+from jose import JWTError, jwk, jwt
 from fastapi import HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from passlib.context import CryptContext
+import bcrypt
+import hashlib
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import VerifyMismatchError
+except ImportError:  # argon2-cffi is an optional extra
+    PasswordHasher = None
+
 # Load environment variables from .env  file
 load_dotenv()
 
 SECRET_KEY = os.environ.get("SECRET_KEY")
 assert SECRET_KEY is not None, "SECRET_KEY environment variable is not set"
-ALGORITHM = "HS256"
+ALGORITHM = os.environ.get("JWT_ALGORITHM", "HS256")
+# PEM public key for asymmetric algorithms (ES256, RS256, ...); unused for HS*
+PUBLIC_KEY = os.environ.get("PUBLIC_KEY")
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def _verify_key(signing_key, algorithm, public_key=None):
+    # HS* verifies with the shared secret; asymmetric algorithms need a public key,
+    # taken from PUBLIC_KEY or derived from the private signing key
+    if algorithm.startswith("HS"):
+        return signing_key
+    if public_key:
+        return jwk.construct(public_key, algorithm)
+    return signing_key.public_key()
+
+
+# Built once so encode/decode skip per-call key parsing and option setup
+_JWT_KEY = jwk.construct(SECRET_KEY, ALGORITHM)
+_JWT_VERIFY_KEY = _verify_key(_JWT_KEY, ALGORITHM, PUBLIC_KEY)
+_DECODE_ALGORITHMS = frozenset([ALGORITHM])
+_DECODE_OPTIONS = {"verify_aud": False}
+
+TOKEN_CACHE_TTL_SECONDS = 5
+TOKEN_CACHE_MAXSIZE = 10000
+
+BCRYPT_ROUNDS = 12
+# "bcrypt" (default) or "argon2"; existing hashes of either scheme keep verifying
+PASSWORD_HASH_SCHEME = os.environ.get("PASSWORD_HASH_SCHEME", "bcrypt").lower()
+assert PASSWORD_HASH_SCHEME in ("bcrypt", "argon2"), "Unsupported PASSWORD_HASH_SCHEME"
+assert (
+    PASSWORD_HASH_SCHEME != "argon2" or PasswordHasher is not None
+), "PASSWORD_HASH_SCHEME=argon2 requires the argon2-cffi package"
+
+argon2_hasher = PasswordHasher() if PasswordHasher is not None else None
 security = HTTPBearer()
 
+# Recently verified tokens, keyed by sha256(token), to skip re-decoding on hot endpoints
+_token_cache = TTLCache(maxsize=TOKEN_CACHE_MAXSIZE, ttl=TOKEN_CACHE_TTL_SECONDS)
+_token_cache_lock = threading.Lock()
+
 
 class JwtHandler:
     @staticmethod
     def verify_password(plain_password, hashed_password):
-        return pwd_context.verify(plain_password, hashed_password)
+        if hashed_password.startswith("$argon2"):
+            if argon2_hasher is None:
+                raise ValueError("argon2-cffi is required to verify argon2 hashes")
+            try:
+                return argon2_hasher.verify(hashed_password, plain_password)
+            except VerifyMismatchError:
+                return False
+
+        # bcrypt only uses the first 72 bytes of the UTF-8 encoded password
+        return bcrypt.checkpw(
+            plain_password.encode("utf-8")[:72], hashed_password.encode("utf-8")
+        )
 
     @staticmethod
     def get_password_hash(password):
+        if PASSWORD_HASH_SCHEME == "argon2":
+            return argon2_hasher.hash(password)  # type: ignore
+
         # Truncate password to 72 bytes as required by bcrypt
-        password_bytes = password.encode("utf-8")
-        if len(password_bytes) > 72:
-            password = password_bytes[:72].decode("utf-8", errors="ignore")
-        return pwd_context.hash(password)
+        password_bytes = password.encode("utf-8")[:72]
+        return bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode(
+            "utf-8"
+        )
+
+    @staticmethod
+    async def verify_password_async(plain_password, hashed_password):
+        # bcrypt is CPU bound; run it off the event loop so concurrent logins don't serialize
+        return await run_in_threadpool(
+            JwtHandler.verify_password, plain_password, hashed_password
+        )
+
+    @staticmethod
+    async def get_password_hash_async(password):
+        return await run_in_threadpool(JwtHandler.get_password_hash, password)
 
     @staticmethod
     def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
-        to_encode = data.copy()
         if expires_delta:
-            expire = datetime.now(timezone.utc) + expires_delta
+            expires_in = int(expires_delta.total_seconds())
         else:
-            expire = datetime.now(timezone.utc) + timedelta(
-                minutes=ACCESS_TOKEN_EXPIRE_MINUTES
-            )
-        to_encode.update({"exp": expire})
-        encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)  # type: ignore
+            expires_in = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        # exp as a Unix timestamp, which is what jose would convert a datetime to
+        to_encode = {**data, "exp": int(time.time()) + expires_in}
+        encoded_jwt = jwt.encode(to_encode, _JWT_KEY, algorithm=ALGORITHM)
         return encoded_jwt
 
     @staticmethod
     def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+        cache_key = hashlib.sha256(credentials.credentials.encode("utf-8")).digest()
+        with _token_cache_lock:
+            cached = _token_cache.get(cache_key)
+        if cached is not None:
+            user, exp = cached
+            # Never serve a token past its own expiry, even within the cache TTL
+            if exp is None or exp > time.time():
+                return dict(user)
+
         try:
             payload = jwt.decode(
-                credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM], options={"verify_aud": False}  # type: ignore
+                credentials.credentials,
+                _JWT_VERIFY_KEY,
+                algorithms=_DECODE_ALGORITHMS,  # type: ignore
+                options=_DECODE_OPTIONS,
             )
             username = payload.get("sub")
             role = payload.get("role")
 
             if username is None or role is None:
                 raise HTTPException(status_code=404, detail="no user or role")
-            return {"username": username, "role": role}
+
+            user = {"username": username, "role": role}
+            with _token_cache_lock:
+                _token_cache[cache_key] = (user, payload.get("exp"))
+            return dict(user)
 
         except JWTError:
             raise HTTPException(status_code=401, detail="Invalid token")
@@ -1,18 +1,55 @@
+import atexit
 import logging
 import os
+import queue
 import stat
+import threading
 import traceback
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    TimedRotatingFileHandler,
+    WatchedFileHandler,
+)
 from pathlib import Path
 import tempfile
 
+# Absolute log path based on project root, computed once at import
+_PROJECT_ROOT = Path(__file__).parent.parent.parent
+_PREFERRED_LOG_DIR = _PROJECT_ROOT / "src" / "utils" / "log"
+
+# "midnight" (default) rotates files in-process every day. "external" leaves rotation
+# to logrotate and reopens moved files, which is safe with several worker processes.
+_LOG_ROTATION = os.environ.get("MS_LOG_ROTATION", "midnight").strip().lower()
+
+# Set MS_LOG_DEBUG to print full tracebacks when the logger itself fails
+_LOG_DEBUG = bool(os.environ.get("MS_LOG_DEBUG"))
+
+_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warn": logging.WARNING,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL,
+}
+
 
 class Logger:
+    # The logger is configured on first use and reused for every later call
+    _logger = None
+    _listener = None
+    _setup_lock = threading.Lock()
+    # Requested log directory -> directory actually usable, resolved once per process
+    _resolved_log_directories = {}
 
     @staticmethod
     def _fix_permissions(path, is_directory=True):
         """
         Fix permissions for a file or directory to ensure proper access.
+        Applied once to the directories and log files the logger creates, so they
+        are group-writable (775/664) whatever the process umask, and on demand by
+        fix_all_permissions.
 
         Args:
             path (Path): Path to the file or directory
@@ -43,23 +80,45 @@ class Logger:
         """
         Ensures that the log directory exists with proper permissions.
         Handles permission conflicts and provides multiple fallback options.
+        The fallback chain runs once per requested directory; later calls
+        return the cached result while that directory still exists.
+        """
+        key = str(log_directory)
+        resolved = Logger._resolved_log_directories.get(key)
+        # Only called when (re)configuring handlers or repairing, never per record
+        if resolved is None or not os.path.isdir(resolved):
+            resolved = Logger._resolve_log_directory(log_directory)
+            Logger._resolved_log_directories[key] = resolved
+        return resolved
+
+    @staticmethod
+    def _make_log_directory(path):
+        """
+        Create a log directory, making it group-writable only if it is new.
+
+        Args:
+            path (Path): Path to the directory
+        """
+        existed = path.exists()
+        path.mkdir(parents=True, exist_ok=True)
+        if not existed:
+            Logger._fix_permissions(path, is_directory=True)
+
+    @staticmethod
+    def _resolve_log_directory(log_directory):
+        """
+        Walks the fallback chain and returns the first writable log directory.
         """
         log_path = Path(log_directory)
 
         # Strategy 1: Try to create/use the requested directory
         try:
-            log_path.mkdir(parents=True, exist_ok=True)
-            Logger._fix_permissions(log_path, is_directory=True)
+            Logger._make_log_directory(log_path)
 
-            # Test write access by creating a temporary file
-            test_file = log_path / ".write_test"
-            try:
-                test_file.write_text("test", encoding="utf-8")
-                test_file.unlink()  # Clean up test file
-                return str(log_path)
-            except (PermissionError, OSError) as e:
-                print(f"Write test failed for {log_path}: {e}")
+            # Test write access
+            if not os.access(log_path, os.W_OK):
                 raise PermissionError(f"Cannot write to {log_path}")
+            return str(log_path)
 
         except (PermissionError, OSError) as e:
             print(f"Cannot use primary log directory {log_directory}: {e}")
@@ -67,12 +126,10 @@ class Logger:
         # Strategy 2: Try user-specific directory in home
         try:
             user_log_dir = Path.home() / ".pms_backend" / "logs"
-            user_log_dir.mkdir(parents=True, exist_ok=True)
-            Logger._fix_permissions(user_log_dir, is_directory=True)
+            Logger._make_log_directory(user_log_dir)
 
-            test_file = user_log_dir / ".write_test"
-            test_file.write_text("test", encoding="utf-8")
-            test_file.unlink()
+            if not os.access(user_log_dir, os.W_OK):
+                raise PermissionError(f"Cannot write to {user_log_dir}")
 
             return str(user_log_dir)
 
@@ -82,12 +139,10 @@ class Logger:
         # Strategy 3: Try system temp directory
         try:
             temp_log_dir = Path(tempfile.gettempdir()) / "pms_backend_logs"
-            temp_log_dir.mkdir(parents=True, exist_ok=True)
-            Logger._fix_permissions(temp_log_dir, is_directory=True)
+            Logger._make_log_directory(temp_log_dir)
 
-            test_file = temp_log_dir / ".write_test"
-            test_file.write_text("test", encoding="utf-8")
-            test_file.unlink()
+            if not os.access(temp_log_dir, os.W_OK):
+                raise PermissionError(f"Cannot write to {temp_log_dir}")
 
             return str(temp_log_dir)
 
@@ -97,12 +152,10 @@ class Logger:
         # Strategy 4: Fallback to current working directory
         try:
             fallback_dir = Path.cwd() / "logs"
-            fallback_dir.mkdir(parents=True, exist_ok=True)
-            Logger._fix_permissions(fallback_dir, is_directory=True)
+            Logger._make_log_directory(fallback_dir)
 
-            test_file = fallback_dir / ".write_test"
-            test_file.write_text("test", encoding="utf-8")
-            test_file.unlink()
+            if not os.access(fallback_dir, os.W_OK):
+                raise PermissionError(f"Cannot write to {fallback_dir}")
 
             return str(fallback_dir)
 
@@ -113,187 +166,170 @@ class Logger:
         temp_dir = Path(tempfile.mkdtemp(prefix="pms_logs_"))
         return str(temp_dir)
 
-    def __set_access_logger(self):
-        # Use absolute path based on project root
-        project_root = Path(__file__).parent.parent.parent
-        log_directory = project_root / "src" / "utils" / "log"
-        log_filename = "access.log"
-
-        # Ensure log directory exists with improved error handling
-        log_dir_path = self._ensure_log_directory(log_directory)
-
-        logger = logging.getLogger("access")
-        logger.setLevel(logging.DEBUG)
-
-        log_path = Path(log_dir_path) / log_filename
+    @staticmethod
+    def _open_file_handler(path):
+        """
+        Open the file handler for a log path according to MS_LOG_ROTATION.
 
-        try:
-            # Create log file if it doesn't exist and set proper permissions
-            if not log_path.exists():
-                log_path.touch()
-                self._fix_permissions(log_path, is_directory=False)
+        Args:
+            path (Path): Path to the log file
+        """
+        is_new = not path.exists()
 
+        if _LOG_ROTATION == "external":
+            # Reopens the file after logrotate moves it; no rotation races between workers
+            handler = WatchedFileHandler(str(path), encoding="utf-8")
+        else:
             # Use TimedRotatingFileHandler for daily rotation at midnight
-            file_handler = TimedRotatingFileHandler(
-                str(log_path),
+            handler = TimedRotatingFileHandler(
+                str(path),
                 when="midnight",
                 interval=1,
                 backupCount=30,
                 encoding="utf-8",
             )
-            file_handler.setLevel(logging.DEBUG)
 
-            formatter = logging.Formatter(
-                "%(asctime)s | %(levelname)s | %(message)s", "%Y-%m-%d %H:%M:%S"
-            )
-            file_handler.setFormatter(formatter)
+        if is_new:
+            Logger._fix_permissions(path, is_directory=False)
+        return handler
 
-            if logger.hasHandlers():
-                logger.handlers.clear()
+    @classmethod
+    def _build_handler(cls, name, filename, level):
+        """
+        Build the file handler for one log file, falling back to an alternative
+        file name and finally to the console if the file cannot be opened.
 
-            logger.addHandler(file_handler)
+        Args:
+            name (str): Short name of the log, used in messages and fallback file names
+            filename (str): Log file name inside the log directory
+            level (int): Minimum level the handler emits
+        """
+        # Ensure log directory exists with improved error handling
+        log_dir_path = cls._ensure_log_directory(_PREFERRED_LOG_DIR)
 
-            # Test write access
-            test_record = logging.LogRecord(
-                name="access",
-                level=logging.DEBUG,
-                pathname="",
-                lineno=0,
-                msg="Logger initialization test",
-                args=(),
-                exc_info=None,
-            )
-            file_handler.emit(test_record)
+        log_path = Path(log_dir_path) / filename
+
+        formatter = logging.Formatter(
+            "%(asctime)s | %(levelname)s | %(message)s", "%Y-%m-%d %H:%M:%S"
+        )
+
+        try:
+            handler = cls._open_file_handler(log_path)
 
         except (PermissionError, OSError) as e:
-            print(f"Permission error setting up access logger: {e}")
+            print(f"Permission error setting up {name} logger: {e}")
             # Try alternative file name in case of permission conflicts
             try:
                 import uuid
 
-                alternative_name = f"access_{uuid.uuid4().hex[:8]}.log"
+                alternative_name = f"{name}_{uuid.uuid4().hex[:8]}.log"
                 alternative_path = Path(log_dir_path) / alternative_name
-                alternative_path.touch()
-                self._fix_permissions(alternative_path, is_directory=False)
-
-                file_handler = TimedRotatingFileHandler(
-                    str(alternative_path),
-                    when="midnight",
-                    interval=1,
-                    backupCount=30,
-                    encoding="utf-8",
-                )
-                file_handler.setLevel(logging.DEBUG)
-                file_handler.setFormatter(formatter)
-                logger.addHandler(file_handler)
+
+                handler = cls._open_file_handler(alternative_path)
 
             except Exception as e2:
-                print(f"Failed to create alternative access log: {e2}")
+                print(f"Failed to create alternative {name} log: {e2}")
                 # Fallback to console logging
-                console_handler = logging.StreamHandler()
-                console_handler.setLevel(logging.DEBUG)
-                console_handler.setFormatter(formatter)
-                logger.addHandler(console_handler)
+                handler = logging.StreamHandler()
 
         except Exception as e:
-            print(f"Error setting up access logger: {e}")
+            print(f"Error setting up {name} logger: {e}")
             # Fallback to console logging
-            console_handler = logging.StreamHandler()
-            console_handler.setLevel(logging.DEBUG)
-            logger.addHandler(console_handler)
-
-        return logger
-
-    def __set_error_logger(self):
-        # Use absolute path based on project root
-        project_root = Path(__file__).parent.parent.parent
-        log_directory = project_root / "src" / "utils" / "log"
-        log_filename = "error.log"
-
-        # Ensure log directory exists with improved error handling
-        log_dir_path = self._ensure_log_directory(log_directory)
-
-        logger = logging.getLogger("error")
-        logger.setLevel(logging.WARNING)
-
-        log_path = Path(log_dir_path) / log_filename
-
-        try:
-            # Create log file if it doesn't exist and set proper permissions
-            if not log_path.exists():
-                log_path.touch()
-                self._fix_permissions(log_path, is_directory=False)
-
-            # Use TimedRotatingFileHandler for daily rotation at midnight
-            file_handler = TimedRotatingFileHandler(
-                str(log_path),
-                when="midnight",
-                interval=1,
-                backupCount=30,
-                encoding="utf-8",
-            )
-            file_handler.setLevel(logging.WARNING)
-
-            formatter = logging.Formatter(
-                "%(asctime)s | %(levelname)s | %(message)s", "%Y-%m-%d %H:%M:%S"
-            )
-            file_handler.setFormatter(formatter)
+            handler = logging.StreamHandler()
 
-            if logger.hasHandlers():
-                logger.handlers.clear()
+        handler.setLevel(level)
+        handler.setFormatter(formatter)
+        return handler
 
-            logger.addHandler(file_handler)
-
-            # Test write access
-            test_record = logging.LogRecord(
-                name="error",
-                level=logging.WARNING,
-                pathname="",
-                lineno=0,
-                msg="Logger initialization test",
-                args=(),
-                exc_info=None,
-            )
-            file_handler.emit(test_record)
+    @classmethod
+    def _get_logger(cls):
+        """
+        Return the shared logger, configuring it on first use.
 
-        except (PermissionError, OSError) as e:
-            print(f"Permission error setting up error logger: {e}")
-            # Try alternative file name in case of permission conflicts
-            try:
-                import uuid
+        A single logger carries both handlers; the handlers' levels and filters
+        route debug/info records to access.log and warnings and above to error.log.
+        The file handlers run on a background QueueListener thread, so logging
+        calls only enqueue the record and never wait on disk I/O. A forked child
+        does not inherit that thread, so it builds its own logger on first use.
+        """
+        if cls._logger is None:
+            with cls._setup_lock:
+                if cls._logger is None:
+                    logger = logging.getLogger("microservices_utils")
+                    logger.setLevel(logging.DEBUG)
+
+                    if logger.hasHandlers():
+                        logger.handlers.clear()
+
+                    access_handler = cls._build_handler(
+                        "access", "access.log", logging.DEBUG
+                    )
+                    # The access log only receives debug and info records
+                    access_handler.addFilter(
+                        lambda record: record.levelno <= logging.INFO
+                    )
+                    error_handler = cls._build_handler(
+                        "error", "error.log", logging.WARNING
+                    )
+
+                    log_queue = queue.SimpleQueue()
+                    cls._listener = QueueListener(
+                        log_queue,
+                        access_handler,
+                        error_handler,
+                        respect_handler_level=True,
+                    )
+                    cls._listener.start()
+
+                    logger.addHandler(QueueHandler(log_queue))
+                    cls._logger = logger
+        return cls._logger
 
-                alternative_name = f"error_{uuid.uuid4().hex[:8]}.log"
-                alternative_path = Path(log_dir_path) / alternative_name
-                alternative_path.touch()
-                self._fix_permissions(alternative_path, is_directory=False)
-
-                file_handler = TimedRotatingFileHandler(
-                    str(alternative_path),
-                    when="midnight",
-                    interval=1,
-                    backupCount=30,
-                    encoding="utf-8",
-                )
-                file_handler.setLevel(logging.WARNING)
-                file_handler.setFormatter(formatter)
-                logger.addHandler(file_handler)
+    @classmethod
+    def _stop_listener(cls):
+        """
+        Stop the listener thread, writing out any records still queued, and close
+        its log files. The next logging call configures the logger again.
+        """
+        with cls._setup_lock:
+            logger, listener = cls._logger, cls._listener
+            cls._logger = None
+            cls._listener = None
+        cls._discard(logger, listener, stop=True)
 
-            except Exception as e2:
-                print(f"Failed to create alternative error log: {e2}")
-                # Fallback to console logging
-                console_handler = logging.StreamHandler()
-                console_handler.setLevel(logging.WARNING)
-                console_handler.setFormatter(formatter)
-                logger.addHandler(console_handler)
+    @classmethod
+    def _reset_after_fork(cls):
+        """
+        Forget the parent's logger in a forked child. The child has the queue
+        but not the listener thread, so records would never be written.
+        """
+        logger, listener = cls._logger, cls._listener
+        cls._logger = None
+        cls._listener = None
+        # The lock may have been held by another thread of the parent at fork time
+        cls._setup_lock = threading.Lock()
+        # Close the child's copies of the parent's files; the parent keeps its own
+        cls._discard(logger, listener, stop=False)
 
-        except Exception as e:
-            print(f"Error setting up error logger: {e}")
-            # Fallback to console logging
-            console_handler = logging.StreamHandler()
-            console_handler.setLevel(logging.WARNING)
-            logger.addHandler(console_handler)
+    @staticmethod
+    def _discard(logger, listener, stop):
+        """
+        Detach the queue handler from the logger and close the listener's handlers.
 
-        return logger
+        Args:
+            logger (logging.Logger): The configured logger, or None
+            listener (QueueListener): Its listener, or None
+            stop (bool): Whether to stop the listener thread first
+        """
+        if logger is not None:
+            # Nothing reads the queue any more
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+        if listener is not None:
+            if stop:
+                listener.stop()
+            for handler in listener.handlers:
+                handler.close()
 
     @classmethod
     def add_to_log(cls, level, message):
@@ -314,73 +350,81 @@ class Logger:
 
             level = level.lower().strip()
 
-            # Determine which logger to use
-            if level in ["debug", "info"]:
-                logger = cls.__set_access_logger(cls)
-            elif level in ["warn", "warning", "error", "critical"]:
-                logger = cls.__set_error_logger(cls)
-            else:
-                # Default to error logger for unknown levels
-                logger = cls.__set_error_logger(cls)
+            numeric_level = _LEVELS.get(level)
+            if numeric_level is None:
+                # Default to error level for unknown levels
                 message = f"[UNKNOWN_LEVEL:{level}] {message}"
-                level = "error"
-
-            # Log the message with appropriate level
-            if level == "critical":
-                logger.critical(message)
-            elif level == "debug":
-                logger.debug(message)
-            elif level == "error":
-                logger.error(message)
-            elif level == "info":
-                logger.info(message)
-            elif level in ["warn", "warning"]:
-                logger.warning(message)
+                numeric_level = logging.ERROR
+
+            cls._get_logger().log(numeric_level, message)
 
         except Exception as ex:
-            # Enhanced error reporting
-            error_msg = (
-                f"Logger error: {str(ex)}\nOriginal message: {message}\nLevel: {level}"
-            )
-            print(f"LOGGER ERROR: {error_msg}")
+            cls._report_failure(ex, level, message)
+
+    @staticmethod
+    def _report_failure(ex, level, message):
+        """
+        Report a logging failure on the console; logging calls never raise.
+
+        Args:
+            ex (Exception): The error raised while logging
+            level (str): The requested log level
+            message (str): The message that could not be logged
+        """
+        # Enhanced error reporting
+        error_msg = (
+            f"Logger error: {str(ex)}\nOriginal message: {message}\nLevel: {level}"
+        )
+        print(f"LOGGER ERROR: {error_msg}")
+        if _LOG_DEBUG:
             print(f"Traceback: {traceback.format_exc()}")
 
-            # Try to log to console as last resort
-            try:
-                print(f"[{level.upper()}] {message}")
-            except:
-                print("Failed to log message to console as well")
+        # Try to log to console as last resort
+        try:
+            print(f"[{level.upper()}] {message}")
+        except:
+            print("Failed to log message to console as well")
 
     @classmethod
-    def debug(cls, message):
-        """Log a debug message"""
-        cls.add_to_log("debug", message)
+    def _log(cls, level, message, args):
+        """
+        Log a message at a numeric level, with the same never-raise contract as
+        add_to_log. %-style args are interpolated only if the record is emitted.
+        """
+        try:
+            cls._get_logger().log(level, message, *args)
+        except Exception as ex:
+            cls._report_failure(ex, logging.getLevelName(level).lower(), message)
 
     @classmethod
-    def info(cls, message):
-        """Log an info message"""
-        cls.add_to_log("info", message)
+    def debug(cls, message, *args):
+        """Log a debug message; %-style args are interpolated only if it is emitted"""
+        cls._log(logging.DEBUG, message, args)
 
     @classmethod
-    def warning(cls, message):
-        """Log a warning message"""
-        cls.add_to_log("warn", message)
+    def info(cls, message, *args):
+        """Log an info message; %-style args are interpolated only if it is emitted"""
+        cls._log(logging.INFO, message, args)
 
     @classmethod
-    def error(cls, message):
-        """Log an error message"""
-        cls.add_to_log("error", message)
+    def warning(cls, message, *args):
+        """Log a warning message; %-style args are interpolated only if it is emitted"""
+        cls._log(logging.WARNING, message, args)
 
     @classmethod
-    def critical(cls, message):
-        """Log a critical message"""
-        cls.add_to_log("critical", message)
+    def error(cls, message, *args):
+        """Log an error message; %-style args are interpolated only if it is emitted"""
+        cls._log(logging.ERROR, message, args)
+
+    @classmethod
+    def critical(cls, message, *args):
+        """Log a critical message; %-style args are interpolated only if it is emitted"""
+        cls._log(logging.CRITICAL, message, args)
 
     @classmethod
     def get_log_directory(cls):
         """Get the current log directory path"""
-        project_root = Path(__file__).parent.parent.parent
-        return project_root / "src" / "utils" / "log"
+        return _PREFERRED_LOG_DIR
 
     @classmethod
     def cleanup_old_logs(cls, days_to_keep=30):
@@ -494,11 +538,8 @@ class Logger:
         Returns:
             Path: The effective log directory path
         """
-        project_root = Path(__file__).parent.parent.parent
-        preferred_log_dir = project_root / "src" / "utils" / "log"
-
         # Use the same logic as _ensure_log_directory to determine actual directory
-        effective_dir = cls._ensure_log_directory(preferred_log_dir)
+        effective_dir = cls._ensure_log_directory(_PREFERRED_LOG_DIR)
         return Path(effective_dir)
 
     @classmethod
@@ -509,26 +550,39 @@ class Logger:
         Returns:
             dict: Detailed diagnostic information
         """
+        # Resolved once per process by _ensure_log_directory, reused below
+        effective_dir = cls.get_effective_log_directory()
+
+        if hasattr(os, "umask"):
+            # os.umask can only be read by setting it; restore the original value
+            current_umask = os.umask(0o022)
+            os.umask(current_umask)
+            umask = oct(current_umask)
+        else:
+            umask = "unknown"
+
         diagnosis = {
             "timestamp": str(Path(__file__).stat().st_mtime),
             "preferred_directory": str(cls.get_log_directory()),
-            "effective_directory": str(cls.get_effective_log_directory()),
+            "effective_directory": str(effective_dir),
             "permission_status": cls.check_permissions(),
             "current_user": os.getuid() if hasattr(os, "getuid") else "unknown",
             "current_group": os.getgid() if hasattr(os, "getgid") else "unknown",
-            "umask": oct(os.umask(0o022)) if hasattr(os, "umask") else "unknown",
+            "umask": umask,
         }
 
-        # Reset umask if we changed it
-        if hasattr(os, "umask"):
-            os.umask(0o022)
-
         # Test write capabilities
-        try:
-            test_logger = cls()
-            test_logger._ensure_log_directory(cls.get_effective_log_directory())
+        if os.access(effective_dir, os.W_OK):
             diagnosis["write_test"] = "success"
-        except Exception as e:
-            diagnosis["write_test"] = f"failed: {e}"
+        else:
+            diagnosis["write_test"] = f"failed: cannot write to {effective_dir}"
 
         return diagnosis
+
+
+# Drain pending records before the interpreter exits
+atexit.register(Logger._stop_listener)
+
+if hasattr(os, "register_at_fork"):
+    # Workers forked after the parent logged (e.g. gunicorn --preload) start clean
+    os.register_at_fork(after_in_child=Logger._reset_after_fork)
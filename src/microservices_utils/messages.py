@@ -4,12 +4,20 @@ Este enfoque permite mantener la consistencia de los mensajes, facilitar la inte
 y simplificar el mantenimiento de los textos en toda la aplicación.
 """
 
+import functools
+import sys
+import types
 from enum import Enum
 
 
 class BaseMessages(Enum):
     """Clase base para todas las enumeraciones de mensajes"""
 
+    def __init__(self, *args):
+        # Internar los textos para que las comparaciones y búsquedas en diccionarios
+        # usen la ruta rápida por identidad
+        self._value_ = sys.intern(self._value_)
+
     @staticmethod
     def _generate_next_value_(name, start, count, last_values):
         """Convierte los nombres de enumeración en formato snake_case a una cadena legible"""
@@ -20,6 +28,47 @@ class BaseMessages(Enum):
         """Retorna el mensaje asociado a la enumeración"""
         return self.value
 
+    @functools.cached_property
+    def _template(self):
+        """
+        Plantilla pre-analizada del mensaje como tupla de pares (literal, campo).
+        Es None si la plantilla usa campos que requieren el formateo completo de str.format.
+        """
+        # Importado aquí para no cargar el módulo string al importar los catálogos
+        import string
+
+        parts = []
+        for literal, field_name, format_spec, conversion in string.Formatter().parse(
+            self.value
+        ):
+            if field_name is not None and (
+                not field_name.isidentifier() or format_spec or conversion
+            ):
+                return None
+            parts.append((literal, field_name))
+        return tuple(parts)
+
+    def format(self, /, **kwargs):
+        """
+        Formatea el mensaje con parámetros dinámicos sin volver a analizar la plantilla.
+
+        Args:
+            **kwargs: Parámetros para formatear el mensaje
+
+        Returns:
+            str: El mensaje formateado
+        """
+        template = self._template
+        if template is None:
+            return self.value.format_map(kwargs)
+        if len(template) == 1 and template[0][1] is None:
+            # Mensaje sin campos: el texto ya está resuelto
+            return template[0][0]
+        return "".join(
+            literal if field_name is None else literal + format(kwargs[field_name])
+            for literal, field_name in template
+        )
+
 
 class GeneralMessages(BaseMessages):
     """Mensajes generales de la aplicación"""
@@ -39,6 +88,20 @@ class GeneralMessages(BaseMessages):
     OPERATION_NOT_ALLOWED = "Operación no permitida"
 
 
+def _text_constants(enum_cls):
+    """
+    Crea un espacio de nombres con los textos de una enumeración como constantes str.
+    Permiten usar los mensajes en rutas críticas sin pasar por el descriptor .value del Enum.
+    """
+    return types.SimpleNamespace(
+        **{name: member.value for name, member in enum_cls.__members__.items()}
+    )
+
+
+# Textos de GeneralMessages como str simples (M.SUCCESS == GeneralMessages.SUCCESS.value)
+M = _text_constants(GeneralMessages)
+
+
 class UserMessages(BaseMessages):
     """Mensajes relacionados con usuarios"""
 
@@ -120,6 +183,50 @@ class PermissionMessages(BaseMessages):
     PERMISSION_REMOVED_FROM_ROLE = "Permiso eliminado del rol correctamente"
 
 
+# Mapa de códigos HTTP a mensajes, construido una sola vez al importar el módulo
+_CODE_MAP = {
+    400: M.BAD_REQUEST,
+    401: M.UNAUTHORIZED,
+    403: M.FORBIDDEN,
+    404: M.NOT_FOUND,
+    409: M.CONFLICT,
+    500: M.INTERNAL_SERVER_ERROR,
+}
+
+
+# Alias de módulo de cada catálogo, p. ej. from .messages import user
+general = GeneralMessages
+user = UserMessages
+auth = AuthMessages
+report = ReportMessages
+client = ClientMessages
+role = RoleMessages
+permission = PermissionMessages
+
+# Texto -> miembro de enumeración, construido una vez sobre todos los catálogos.
+# Si un texto aparece en varios catálogos, gana el primero en este orden.
+_REVERSE = {}
+for _catalog in (general, user, auth, report, client, role, permission):
+    for _member in _catalog:
+        _REVERSE.setdefault(_member.value, _member)
+del _catalog, _member
+
+
+def get_by_code(code, default=None):
+    """
+    Obtiene un mensaje basado en un código de error.
+    Útil para mapear códigos HTTP a mensajes específicos.
+
+    Args:
+        code: El código de error (por ejemplo, código HTTP)
+        default: Mensaje por defecto si no se encuentra el código
+
+    Returns:
+        str: El mensaje correspondiente al código
+    """
+    return _CODE_MAP.get(code, default or M.ERROR)
+
+
 class Messages:
     """
     Clase principal para acceder a todos los mensajes de la aplicación.
@@ -134,6 +241,17 @@ class Messages:
     role = RoleMessages
     permission = PermissionMessages
 
+    # Los mismos catálogos como constantes str simples, p. ej. Messages.text.user.USER_CREATED
+    text = types.SimpleNamespace(
+        general=M,
+        user=_text_constants(UserMessages),
+        auth=_text_constants(AuthMessages),
+        report=_text_constants(ReportMessages),
+        client=_text_constants(ClientMessages),
+        role=_text_constants(RoleMessages),
+        permission=_text_constants(PermissionMessages),
+    )
+
     @staticmethod
     def format(message_enum, **kwargs):
         """
@@ -146,27 +264,20 @@ class Messages:
         Returns:
             str: El mensaje formateado
         """
-        return message_enum.value.format(**kwargs)
+        return message_enum.format(**kwargs)
+
+    get_by_code = staticmethod(get_by_code)
 
     @staticmethod
-    def get_by_code(code, default=None):
+    def from_value(value, default=None):
         """
-        Obtiene un mensaje basado en un código de error.
-        Útil para mapear códigos HTTP a mensajes específicos.
+        Obtiene la enumeración de mensaje correspondiente a un texto.
 
         Args:
-            code: El código de error (por ejemplo, código HTTP)
-            default: Mensaje por defecto si no se encuentra el código
+            value: El texto del mensaje
+            default: Valor a devolver si el texto no pertenece a ningún catálogo
 
         Returns:
-            str: El mensaje correspondiente al código
+            BaseMessages: La enumeración del mensaje, o default si no existe
         """
-        code_map = {
-            400: GeneralMessages.BAD_REQUEST.value,
-            401: GeneralMessages.UNAUTHORIZED.value,
-            403: GeneralMessages.FORBIDDEN.value,
-            404: GeneralMessages.NOT_FOUND.value,
-            409: GeneralMessages.CONFLICT.value,
-            500: GeneralMessages.INTERNAL_SERVER_ERROR.value,
-        }
-        return code_map.get(code, default or GeneralMessages.ERROR.value)
+        return _REVERSE.get(value, default)
@@ -1,5 +1,93 @@
-import json
-from .messages import Messages, GeneralMessages
+import functools
+from .messages import M, get_by_code
+
+
+@functools.cache
+def _serializers():
+    """
+    Resuelve en el primer uso las funciones (dumps, dumps_bytes): orjson si está
+    instalado (extra "speedups"), si no el módulo json estándar. Así importar el
+    módulo no carga ningún serializador.
+
+    Con json se serializan igual que con orjson las fechas y horas (ISO 8601), los
+    UUID, los miembros de Enum (su valor) y las dataclasses. Lo que orjson rechaza,
+    como los enteros de más de 64 bits, se serializa de nuevo con json. Solo
+    difieren NaN e infinito: orjson los escribe como null y json como NaN/Infinity.
+    """
+    import dataclasses
+    import datetime
+    import enum
+    import json
+    import uuid
+
+    def default(obj):
+        # Los mismos tipos que orjson serializa de forma nativa
+        if isinstance(obj, (datetime.date, datetime.time)):
+            return obj.isoformat()
+        if isinstance(obj, uuid.UUID):
+            return str(obj)
+        if isinstance(obj, enum.Enum):
+            return obj.value
+        if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+            return dataclasses.asdict(obj)
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    def json_dumps(obj):
+        return json.dumps(
+            obj, ensure_ascii=False, separators=(",", ":"), default=default
+        )
+
+    def json_dumps_bytes(obj):
+        return json_dumps(obj).encode("utf-8")
+
+    try:
+        import orjson
+    except ImportError:
+        return json_dumps, json_dumps_bytes
+
+    def dumps_bytes(obj):
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            return json_dumps_bytes(obj)
+
+    def dumps(obj):
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except orjson.JSONEncodeError:
+            return json_dumps(obj)
+
+    return dumps, dumps_bytes
+
+
+# Plantillas de las respuestas por defecto. Copiar un dict pequeño es más barato que
+# construirlo de nuevo; solo se sobrescriben los campos que difieren.
+_SUCCESS_TEMPLATE = {
+    "success": True,
+    "message": M.SUCCESS,
+    "data": None,
+    "status_code": 200,
+}
+_ERROR_TEMPLATE = {
+    "success": False,
+    "message": M.ERROR,
+    "status_code": 400,
+}
+
+
+def _make_error(message, status_code, error_details=None):
+    # Constructor común de respuestas de error, usado directamente por todos los
+    # métodos de error para no encadenar llamadas a ResponseHandler.error
+    response = _ERROR_TEMPLATE.copy()
+    if message is not M.ERROR:
+        response["message"] = message
+    if status_code != 400:
+        response["status_code"] = status_code
+
+    if error_details is not None:
+        response["error_details"] = error_details
+
+    return response
 
 
 class ResponseHandler:
@@ -9,7 +97,7 @@ class ResponseHandler:
     """
 
     @staticmethod
-    def success(data=None, message=GeneralMessages.SUCCESS.value, status_code=200):
+    def success(data=None, message=M.SUCCESS, status_code=200):
         """
         Genera una respuesta exitosa con formato estándar
 
@@ -19,19 +107,36 @@ class ResponseHandler:
             status_code: Código HTTP de estado (opcional, por defecto 200)
 
         Returns:
-            tuple: Una tupla con el diccionario de respuesta y el código de estado
+            dict: El diccionario de respuesta, con el código de estado
         """
-        response = {
-            "success": True,
-            "message": message,
-            "data": data,
-            "status_code": status_code,
-        }
+        response = _SUCCESS_TEMPLATE.copy()
+        if message is not M.SUCCESS:
+            response["message"] = message
+        if data is not None:
+            response["data"] = data
+        if status_code != 200:
+            response["status_code"] = status_code
 
         return response
 
     @staticmethod
-    def error(message=GeneralMessages.ERROR.value, status_code=400, error_details=None):
+    def specialize(message=M.SUCCESS, status_code=200):
+        """
+        Devuelve una función que genera respuestas exitosas con un mensaje y un
+        código de estado fijos, para endpoints que siempre responden igual salvo
+        por los datos. Se crea una sola función por (mensaje, código).
+
+        Args:
+            message: Mensaje descriptivo de la operación (opcional)
+            status_code: Código HTTP de estado (opcional, por defecto 200)
+
+        Returns:
+            callable: Función respond(data=None) que devuelve el diccionario de respuesta
+        """
+        return _specialized_success(message, status_code)
+
+    @staticmethod
+    def error(message=M.ERROR, status_code=400, error_details=None):
         """
         Genera una respuesta de error con formato estándar
 
@@ -41,21 +146,12 @@ class ResponseHandler:
             error_details: Detalles adicionales del error (opcional)
 
         Returns:
-            tuple: Una tupla con el diccionario de respuesta y el código de estado
+            dict: El diccionario de respuesta, con el código de estado
         """
-        response = {
-            "success": False,
-            "message": message,
-            "status_code": status_code,
-        }
-
-        if error_details is not None:
-            response["error_details"] = error_details
-
-        return response
+        return _make_error(message, status_code, error_details)
 
     @staticmethod
-    def created(data=None, message=GeneralMessages.SUCCESS.value):
+    def created(data=None, message=M.SUCCESS):
         """
         Genera una respuesta para recursos creados exitosamente (HTTP 201)
 
@@ -64,7 +160,7 @@ class ResponseHandler:
             message: Mensaje descriptivo (opcional)
 
         Returns:
-            tuple: Una tupla con el diccionario de respuesta y el código de estado 201
+            dict: El diccionario de respuesta, con el código de estado 201
         """
         return ResponseHandler.success(data, message, 201)
 
@@ -77,13 +173,12 @@ class ResponseHandler:
             resource_name: Nombre del recurso no encontrado (opcional)
 
         Returns:
-            tuple: Una tupla con el diccionario de respuesta y el código de estado 404
+            dict: El diccionario de respuesta, con el código de estado 404
         """
-        message = f"{resource_name} not found"
-        return ResponseHandler.error(message, 404)
+        return _make_error(f"{resource_name} not found", 404)
 
     @staticmethod
-    def forbidden(message=GeneralMessages.FORBIDDEN.value):
+    def forbidden(message=M.FORBIDDEN):
         """
         Genera una respuesta para accesos denegados (HTTP 403)
 
@@ -91,12 +186,12 @@ class ResponseHandler:
             message: Mensaje descriptivo (opcional)
 
         Returns:
-            tuple: Una tupla con el diccionario de respuesta y el código de estado 403
+            dict: El diccionario de respuesta, con el código de estado 403
         """
-        return ResponseHandler.error(message, 403)
+        return _make_error(message, 403)
 
     @staticmethod
-    def unauthorized(message=GeneralMessages.UNAUTHORIZED.value):
+    def unauthorized(message=M.UNAUTHORIZED):
         """
         Genera una respuesta para accesos no autorizados (HTTP 401)
 
@@ -104,12 +199,12 @@ class ResponseHandler:
             message: Mensaje descriptivo (opcional)
 
         Returns:
-            tuple: Una tupla con el diccionario de respuesta y el código de estado 401
+            dict: El diccionario de respuesta, con el código de estado 401
         """
-        return ResponseHandler.error(message, 401)
+        return _make_error(message, 401)
 
     @staticmethod
-    def bad_request(message=GeneralMessages.BAD_REQUEST.value, error_details=None):
+    def bad_request(message=M.BAD_REQUEST, error_details=None):
         """
         Genera una respuesta para solicitudes incorrectas (HTTP 400)
 
@@ -118,12 +213,12 @@ class ResponseHandler:
             error_details: Detalles adicionales del error (opcional)
 
         Returns:
-            tuple: Una tupla con el diccionario de respuesta y el código de estado 400
+            dict: El diccionario de respuesta, con el código de estado 400
         """
-        return ResponseHandler.error(message, 400, error_details)
+        return _make_error(message, 400, error_details)
 
     @staticmethod
-    def conflict(message=GeneralMessages.CONFLICT.value, error_details=None):
+    def conflict(message=M.CONFLICT, error_details=None):
         """
         Genera una respuesta para conflictos, como recursos duplicados (HTTP 409)
 
@@ -132,13 +227,13 @@ class ResponseHandler:
             error_details: Detalles adicionales del error (opcional)
 
         Returns:
-            tuple: Una tupla con el diccionario de respuesta y el código de estado 409
+            dict: El diccionario de respuesta, con el código de estado 409
         """
-        return ResponseHandler.error(message, 409, error_details)
+        return _make_error(message, 409, error_details)
 
     @staticmethod
     def server_error(
-        message=GeneralMessages.INTERNAL_SERVER_ERROR.value, error_details=None
+        message=M.INTERNAL_SERVER_ERROR, error_details=None
     ):
         """
         Genera una respuesta para errores internos del servidor (HTTP 500)
@@ -148,9 +243,9 @@ class ResponseHandler:
             error_details: Detalles adicionales del error (opcional)
 
         Returns:
-            tuple: Una tupla con el diccionario de respuesta y el código de estado 500
+            dict: El diccionario de respuesta, con el código de estado 500
         """
-        return ResponseHandler.error(message, 500, error_details)
+        return _make_error(message, 500, error_details)
 
     @staticmethod
     def _handle_status_code(data, status_code, resource_name):
@@ -163,34 +258,15 @@ class ResponseHandler:
             resource_name: Nombre del recurso para mensajes de error
 
         Returns:
-            tuple: Una tupla con el diccionario de respuesta y el código de estado
+            dict: El diccionario de respuesta, con el código de estado
         """
         message = data if isinstance(data, str) else None
 
-        status_handlers = {
-            404: lambda: ResponseHandler.not_found(resource_name),
-            400: lambda: ResponseHandler.bad_request(
-                message or Messages.get_by_code(400)
-            ),
-            409: lambda: ResponseHandler.conflict(
-                message or f"{resource_name} already exists"
-            ),
-            401: lambda: ResponseHandler.unauthorized(
-                message or Messages.get_by_code(401)
-            ),
-            403: lambda: ResponseHandler.forbidden(
-                message or Messages.get_by_code(403)
-            ),
-            500: lambda: ResponseHandler.server_error(
-                message or Messages.get_by_code(500)
-            ),
-            201: lambda: ResponseHandler.created(data),
-        }
-
         # Usar el manejador específico o devolver éxito con el código proporcionado
-        return status_handlers.get(
-            status_code, lambda: ResponseHandler.success(data, "Success", status_code)
-        )()
+        handler = _STATUS_HANDLERS.get(status_code)
+        if handler is None:
+            return ResponseHandler.success(data, "Success", status_code)
+        return handler(data, resource_name, message)
 
     @staticmethod
     def from_result(result, resource_name="Resource"):
@@ -202,16 +278,15 @@ class ResponseHandler:
             resource_name: Nombre del recurso para mensajes de error (opcional)
 
         Returns:
-            tuple: Una tupla con el diccionario de respuesta y el código de estado apropiado
+            dict: El diccionario de respuesta, con el código de estado apropiado
         """
         # Si el resultado es una tupla, asumimos que tiene el formato (data, status_code)
-        if (
-            isinstance(result, tuple)
-            and len(result) == 2
-            and isinstance(result[1], int)
-        ):
+        if isinstance(result, tuple) and len(result) == 2:
             data, status_code = result
-            return ResponseHandler._handle_status_code(data, status_code, resource_name)
+            if isinstance(status_code, int):
+                return ResponseHandler._handle_status_code(
+                    data, status_code, resource_name
+                )
 
         # Si no es una tupla o no tiene el formato esperado, asumimos éxito
         return ResponseHandler.success(result)
@@ -227,4 +302,126 @@ class ResponseHandler:
         Returns:
             str: La respuesta en formato JSON
         """
-        return json.dumps(response_dict, ensure_ascii=False)
+        return _serializers()[0](response_dict)
+
+    @staticmethod
+    def to_json_bytes(response_dict):
+        """
+        Convierte el diccionario de respuesta a JSON codificado en UTF-8.
+        Evita la decodificación intermedia cuando el framework acepta bytes.
+
+        Args:
+            response_dict: El diccionario de respuesta
+
+        Returns:
+            bytes: La respuesta en formato JSON
+        """
+        return _serializers()[1](response_dict)
+
+    @staticmethod
+    def success_json(data=None, message=M.SUCCESS, status_code=200):
+        """
+        Genera una respuesta exitosa ya serializada a JSON.
+        Las respuestas sin datos con mensaje de texto se serializan una sola vez
+        por (mensaje, código).
+
+        Args:
+            data: Los datos a incluir en la respuesta (opcional)
+            message: Mensaje descriptivo de la operación (opcional)
+            status_code: Código HTTP de estado (opcional, por defecto 200)
+
+        Returns:
+            str: La respuesta en formato JSON
+        """
+        # Solo los mensajes str se usan como clave de caché; otros pueden no ser hashables
+        if data is None and type(message) is str:
+            return _bare_response_json(True, message, status_code)
+        return ResponseHandler.to_json(
+            ResponseHandler.success(data, message, status_code)
+        )
+
+    @staticmethod
+    def error_json(message=M.ERROR, status_code=400, error_details=None):
+        """
+        Genera una respuesta de error ya serializada a JSON.
+        Las respuestas sin detalles con mensaje de texto se serializan una sola vez
+        por (mensaje, código).
+
+        Args:
+            message: Mensaje descriptivo del error (opcional)
+            status_code: Código HTTP de estado (opcional, por defecto 400)
+            error_details: Detalles adicionales del error (opcional)
+
+        Returns:
+            str: La respuesta en formato JSON
+        """
+        if error_details is None and type(message) is str:
+            return _bare_response_json(False, message, status_code)
+        return ResponseHandler.to_json(
+            _make_error(message, status_code, error_details)
+        )
+
+
+@functools.lru_cache(maxsize=256)
+def _bare_response_json(success, message, status_code):
+    # JSON de respuestas sin datos ni detalles, que solo dependen del mensaje y el código
+    if success:
+        response = ResponseHandler.success(None, message, status_code)
+    else:
+        response = _make_error(message, status_code)
+    return ResponseHandler.to_json(response)
+
+
+@functools.lru_cache(maxsize=256)
+def _specialized_success(message, status_code):
+    # La plantilla se construye una vez; cada respuesta es solo una copia con los datos
+    template = ResponseHandler.success(None, message, status_code)
+
+    def respond(data=None):
+        response = template.copy()
+        if data is not None:
+            response["data"] = data
+        return response
+
+    return respond
+
+
+# Manejadores por código de estado para _handle_status_code. Se definen una sola vez
+# a nivel de módulo en lugar de crear lambdas en cada llamada.
+def _handle_not_found(data, resource_name, message):
+    return _make_error(f"{resource_name} not found", 404)
+
+
+def _handle_bad_request(data, resource_name, message):
+    return _make_error(message or get_by_code(400), 400)
+
+
+def _handle_conflict(data, resource_name, message):
+    return _make_error(message or f"{resource_name} already exists", 409)
+
+
+def _handle_unauthorized(data, resource_name, message):
+    return _make_error(message or get_by_code(401), 401)
+
+
+def _handle_forbidden(data, resource_name, message):
+    return _make_error(message or get_by_code(403), 403)
+
+
+def _handle_server_error(data, resource_name, message):
+    return _make_error(message or get_by_code(500), 500)
+
+
+def _handle_created(data, resource_name, message):
+    return ResponseHandler.created(data)
+
+
+_STATUS_HANDLERS = {
+    404: _handle_not_found,
+    400: _handle_bad_request,
+    409: _handle_conflict,
+    401: _handle_unauthorized,
+    403: _handle_forbidden,
+    500: _handle_server_error,
+    201: _handle_created,
+}
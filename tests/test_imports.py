@@ -2,9 +2,12 @@
 Tests for microservices_utils package imports
 """
 
+import contextlib
 import pytest
 import tempfile
 import os
+from pathlib import Path
+from unittest import mock
 
 
 def test_package_imports():
@@ -26,6 +29,13 @@ def test_package_imports():
     except ImportError as e:
         pytest.fail(f"Failed to import package components: {e}")
 
+    # Names cached by the lazy __getattr__ are listed once
+    import microservices_utils
+
+    names = dir(microservices_utils)
+    assert len(names) == len(set(names))
+    assert set(microservices_utils.__all__) <= set(names)
+
 
 def test_response_handler_functionality():
     """Test basic ResponseHandler functionality"""
@@ -41,8 +51,124 @@ def test_response_handler_functionality():
     # Test error response
     response = ResponseHandler.error("Test error")
     assert response["status_code"] == 400
-    assert response["Success"] is False  # Note: Capital S
-    assert response["Message"] == "Test error"
+    assert response["success"] is False
+    assert response["message"] == "Test error"
+
+    # Success and error responses share the same lowercase key names
+    response = ResponseHandler.error("Test error", error_details={"field": "x"})
+    assert set(response) == {"success", "message", "status_code", "error_details"}
+    assert set(ResponseHandler.success()) == {
+        "success",
+        "message",
+        "data",
+        "status_code",
+    }
+
+
+def test_response_handler_from_result():
+    """Test ResponseHandler.from_result dispatch"""
+    from http import HTTPStatus
+    from microservices_utils import ResponseHandler
+
+    response = ResponseHandler.from_result(({"id": 1}, 201))
+    assert response["status_code"] == 201
+    assert response["data"] == {"id": 1}
+
+    response = ResponseHandler.from_result((None, HTTPStatus.NOT_FOUND), "User")
+    assert response["status_code"] == 404
+    assert response["message"] == "User not found"
+
+    response = ResponseHandler.from_result(("Email duplicado", 409))
+    assert response["message"] == "Email duplicado"
+
+    # Only (data, int) tuples are unpacked; other results are returned as data
+    for result in ([1, 2], "ok", {"a": 1, 2: "b"}, ("a", "b")):
+        response = ResponseHandler.from_result(result)
+        assert response["status_code"] == 200
+        assert response["data"] == result
+
+
+def test_response_handler_specialize():
+    """Test success response builders specialized per (message, status_code)"""
+    from microservices_utils import ResponseHandler
+
+    respond = ResponseHandler.specialize("Usuario creado", 201)
+    assert respond is ResponseHandler.specialize("Usuario creado", 201)
+    assert respond({"id": 1}) == ResponseHandler.success({"id": 1}, "Usuario creado", 201)
+    assert respond() == ResponseHandler.success(None, "Usuario creado", 201)
+    assert respond() is not respond()
+
+
+def test_response_handler_json():
+    """Test serialized ResponseHandler responses"""
+    import json
+    from microservices_utils import ResponseHandler
+
+    assert json.loads(ResponseHandler.success_json()) == ResponseHandler.success()
+    assert ResponseHandler.success_json() is ResponseHandler.success_json()
+    assert json.loads(ResponseHandler.success_json({"id": 1})) == (
+        ResponseHandler.success({"id": 1})
+    )
+    assert json.loads(ResponseHandler.error_json("Nope", 404)) == (
+        ResponseHandler.error("Nope", 404)
+    )
+    assert json.loads(ResponseHandler.error_json(error_details={"field": "x"})) == (
+        ResponseHandler.error(error_details={"field": "x"})
+    )
+
+    # Non-str messages, including unhashable ones, skip the cache
+    assert json.loads(ResponseHandler.error_json({"field": "bad"})) == (
+        ResponseHandler.error({"field": "bad"})
+    )
+    assert json.loads(ResponseHandler.success_json(message=["a", "b"])) == (
+        ResponseHandler.success(message=["a", "b"])
+    )
+
+    response = ResponseHandler.success({"nombre": "José"})
+    assert json.loads(ResponseHandler.to_json(response)) == response
+
+    # The json fallback serializes the same types as orjson, the same way
+    import datetime
+    import importlib.util
+    import uuid
+    from unittest import mock
+    from microservices_utils import GeneralMessages, response_handler
+
+    data = {
+        "fecha": datetime.date(2024, 1, 2),
+        "momento": datetime.datetime(2024, 1, 2, 3, 4, 5, 6, datetime.timezone.utc),
+        "hora": datetime.time(1, 2, 3),
+        "id": uuid.UUID(int=5),
+        "mensaje": GeneralMessages.SUCCESS,
+        1: "clave entera",
+    }
+    with mock.patch.dict("sys.modules", {"orjson": None}):
+        response_handler._serializers.cache_clear()
+        try:
+            fallback = ResponseHandler.to_json(data)
+        finally:
+            response_handler._serializers.cache_clear()
+    assert json.loads(fallback) == {
+        "fecha": "2024-01-02",
+        "momento": "2024-01-02T03:04:05.000006+00:00",
+        "hora": "01:02:03",
+        "id": "00000000-0000-0000-0000-000000000005",
+        "mensaje": GeneralMessages.SUCCESS.value,
+        "1": "clave entera",
+    }
+    if importlib.util.find_spec("orjson") is not None:
+        assert ResponseHandler.to_json(data) == fallback
+
+    # Integers wider than 64 bits, which orjson rejects, still serialize
+    response = ResponseHandler.success({"id": 2**70})
+    assert json.loads(ResponseHandler.to_json(response)) == response
+    assert json.loads(ResponseHandler.to_json_bytes(response)) == response
+    assert json.loads(ResponseHandler.success_json({"id": 2**64})) == (
+        ResponseHandler.success({"id": 2**64})
+    )
+    assert ResponseHandler.to_json_bytes(response) == (
+        ResponseHandler.to_json(response).encode("utf-8")
+    )
 
 
 def test_messages_enum():
@@ -73,6 +199,139 @@ def test_logger_functionality():
         assert Logger is not None
 
 
+@contextlib.contextmanager
+def _logger_in(log_dir):
+    """Point Logger at log_dir with a fresh configuration, restoring it afterwards"""
+    from microservices_utils import Logger
+    from microservices_utils import logger as logger_module
+
+    Logger._stop_listener()
+    with mock.patch.object(
+        logger_module, "_PREFERRED_LOG_DIR", Path(log_dir)
+    ), mock.patch.object(Logger, "_resolved_log_directories", {}):
+        try:
+            yield Logger
+        finally:
+            Logger._stop_listener()
+
+
+def test_logger_routing():
+    """Test that records reach access.log or error.log according to their level"""
+    import logging
+    from logging.handlers import TimedRotatingFileHandler, WatchedFileHandler
+
+    with tempfile.TemporaryDirectory() as temp_dir, _logger_in(temp_dir) as Logger:
+        Logger.debug("debug record")
+        Logger.info("info record %s", 42)
+        Logger.warning("warning record")
+        Logger.error("error record")
+        Logger.critical("critical record")
+        Logger.add_to_log("info", "add_to_log record")
+        Logger.add_to_log("verbose", "unknown level record")
+
+        handlers = Logger._listener.handlers
+        assert all(type(h) is TimedRotatingFileHandler for h in handlers)
+        Logger._stop_listener()
+
+        # Stopping closes the log files and detaches the queue handler
+        assert all(h.stream is None for h in handlers)
+        assert logging.getLogger("microservices_utils").handlers == []
+
+        access = (Path(temp_dir) / "access.log").read_text(encoding="utf-8")
+        error = (Path(temp_dir) / "error.log").read_text(encoding="utf-8")
+
+    for record in ("debug record", "info record 42", "add_to_log record"):
+        assert record in access
+        assert record not in error
+    for record in ("warning record", "error record", "critical record"):
+        assert record in error
+        assert record not in access
+    assert "[UNKNOWN_LEVEL:verbose] unknown level record" in error
+
+    # MS_LOG_ROTATION=external leaves rotation to logrotate
+    from microservices_utils import logger as logger_module
+
+    with tempfile.TemporaryDirectory() as temp_dir, _logger_in(temp_dir) as Logger:
+        with mock.patch.object(logger_module, "_LOG_ROTATION", "external"):
+            Logger.info("watched record")
+            handlers = Logger._listener.handlers
+            assert all(type(h) is WatchedFileHandler for h in handlers)
+
+
+@pytest.mark.skipif(not hasattr(os, "umask"), reason="requires POSIX permissions")
+def test_logger_permissions():
+    """Test that new log directories and files are group-writable"""
+    import stat
+
+    old_umask = os.umask(0o022)
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_dir = Path(temp_dir) / "log"
+            with _logger_in(log_dir) as Logger:
+                Logger.info("permission record")
+
+            assert stat.S_IMODE(log_dir.stat().st_mode) == 0o775
+            for name in ("access.log", "error.log"):
+                assert stat.S_IMODE((log_dir / name).stat().st_mode) == 0o664
+    finally:
+        os.umask(old_umask)
+
+
+def test_logger_recreates_deleted_directory():
+    """Test that a log directory deleted after being resolved is created again"""
+    import shutil
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log_dir = Path(temp_dir) / "log"
+        with _logger_in(log_dir) as Logger:
+            assert Logger.get_effective_log_directory() == log_dir
+            shutil.rmtree(log_dir)
+
+            assert Logger.fix_all_permissions()
+            assert log_dir.is_dir()
+
+            # A logger configured afterwards still writes to the directory
+            shutil.rmtree(log_dir)
+            Logger.info("recreated record")
+            Logger._stop_listener()
+            assert "recreated record" in (log_dir / "access.log").read_text(
+                encoding="utf-8"
+            )
+
+
+def test_logger_never_raises():
+    """Test that a failure while configuring the logger does not reach the caller"""
+    from microservices_utils import Logger
+
+    Logger._stop_listener()
+    with mock.patch.object(Logger, "_build_handler", side_effect=OSError("disk")):
+        Logger.info("not written")
+        Logger.error("not written")
+        Logger.add_to_log("info", "not written")
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_logger_after_fork():
+    """Test that a forked child writes its records with its own listener"""
+    with tempfile.TemporaryDirectory() as temp_dir, _logger_in(temp_dir) as Logger:
+        Logger.info("parent record")
+
+        pid = os.fork()
+        if pid == 0:
+            # Child: log, flush and exit without running the parent's test teardown
+            try:
+                Logger.info("child record")
+                Logger._stop_listener()
+            finally:
+                os._exit(0)
+        os.waitpid(pid, 0)
+
+        Logger._stop_listener()
+        content = (Path(temp_dir) / "access.log").read_text(encoding="utf-8")
+        assert "parent record" in content
+        assert "child record" in content
+
+
 def test_jwt_handler_functionality():
     """Test JwtHandler functionality"""
     from microservices_utils import JwtHandler
@@ -87,6 +346,169 @@ def test_jwt_handler_functionality():
     assert token.count(".") == 2
 
 
+def test_messages_format():
+    """Test formatting messages with dynamic parameters"""
+    from microservices_utils import GeneralMessages, Messages
+    from microservices_utils.messages import BaseMessages
+
+    class GreetingMessages(BaseMessages):
+        HELLO = "Hola {name}, tienes {count} mensajes"
+        ESCAPED = "Usa {{llaves}}"
+        PADDED = "Valor {valor:>3}"
+
+    assert GreetingMessages.HELLO.format(name="Ana", count=3) == (
+        "Hola Ana, tienes 3 mensajes"
+    )
+    assert Messages.format(GreetingMessages.HELLO, name="Ana", count=3) == (
+        "Hola Ana, tienes 3 mensajes"
+    )
+    assert GreetingMessages.ESCAPED.format() == "Usa {llaves}"
+    assert GreetingMessages.PADDED.format(valor=7) == "Valor   7"
+    assert Messages.format(GeneralMessages.SUCCESS) == GeneralMessages.SUCCESS.value
+
+    with pytest.raises(KeyError):
+        GreetingMessages.HELLO.format(name="Ana")
+
+
+def test_create_access_token_claims():
+    """Test that create_access_token accepts exactly the claims jose accepts"""
+    import uuid
+    from datetime import datetime, timezone
+    from jose import jwt
+    from microservices_utils import JwtHandler, jwt_utils
+
+    issued_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    claims = {"sub": "testuser", "iat": issued_at, "big": 2**70, "ids": [1, "a"]}
+    token = JwtHandler.create_access_token(claims)
+    payload = jwt.get_unverified_claims(token)
+    assert payload["iat"] == int(issued_at.timestamp())
+    assert payload["big"] == 2**70
+    # Same token as encoding the claims with jose directly
+    assert token == jwt.encode(
+        {**claims, "exp": payload["exp"]}, jwt_utils.SECRET_KEY, algorithm="HS256"
+    )
+
+    # Values jose cannot serialize are rejected the same way
+    for value in (issued_at, uuid.uuid4()):
+        with pytest.raises(TypeError):
+            jwt.encode({"value": value}, "key", algorithm="HS256")
+        with pytest.raises(TypeError):
+            JwtHandler.create_access_token({"value": value})
+
+
+def test_verify_token_cache():
+    """Test that verify_token decodes tokens and serves repeats from its cache"""
+    from datetime import timedelta
+    from fastapi import HTTPException
+    from fastapi.security import HTTPAuthorizationCredentials
+    from microservices_utils import JwtHandler
+
+    token = JwtHandler.create_access_token({"sub": "testuser", "role": "admin"})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    first = JwtHandler.verify_token(credentials)
+    second = JwtHandler.verify_token(credentials)
+    assert first == second == {"username": "testuser", "role": "admin"}
+    assert first is not second
+
+    expired = JwtHandler.create_access_token(
+        {"sub": "testuser", "role": "admin"}, timedelta(seconds=-1)
+    )
+    with pytest.raises(HTTPException) as exc_info:
+        JwtHandler.verify_token(
+            HTTPAuthorizationCredentials(scheme="Bearer", credentials=expired)
+        )
+    assert exc_info.value.status_code == 401
+
+
+def test_verify_token_es256():
+    """Test ES256 tokens round-trip with and without PUBLIC_KEY"""
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from fastapi.security import HTTPAuthorizationCredentials
+    from jose import jwk
+    from microservices_utils import JwtHandler, jwt_utils
+
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = (
+        private_key.public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+    signing_key = jwk.construct(private_pem, "ES256")
+
+    for public_key in (public_pem, None):
+        verify_key = jwt_utils._verify_key(signing_key, "ES256", public_key)
+        assert verify_key.is_public()
+        with mock.patch.multiple(
+            jwt_utils,
+            ALGORITHM="ES256",
+            _JWT_KEY=signing_key,
+            _JWT_VERIFY_KEY=verify_key,
+            _DECODE_ALGORITHMS=frozenset(["ES256"]),
+        ):
+            token = JwtHandler.create_access_token({"sub": "testuser", "role": "admin"})
+            credentials = HTTPAuthorizationCredentials(
+                scheme="Bearer", credentials=token
+            )
+            assert JwtHandler.verify_token(credentials) == {
+                "username": "testuser",
+                "role": "admin",
+            }
+
+
+def test_password_hashing():
+    """Test JwtHandler password hashing and verification"""
+    import asyncio
+    from microservices_utils import JwtHandler
+
+    hashed = JwtHandler.get_password_hash("s3cret")
+    assert hashed.startswith("$2b$")
+    assert JwtHandler.verify_password("s3cret", hashed)
+    assert not JwtHandler.verify_password("wrong", hashed)
+
+    # Passwords longer than 72 bytes are truncated consistently
+    long_password = "x" * 100
+    hashed = JwtHandler.get_password_hash(long_password)
+    assert JwtHandler.verify_password(long_password, hashed)
+
+    # Async variants run on the threadpool
+    hashed = asyncio.run(JwtHandler.get_password_hash_async("s3cret"))
+    assert asyncio.run(JwtHandler.verify_password_async("s3cret", hashed))
+
+
+def test_password_hashing_argon2():
+    """Test the argon2 password hash scheme and verifying older bcrypt hashes"""
+    from unittest import mock
+    from microservices_utils import JwtHandler, jwt_utils
+
+    pytest.importorskip("argon2")
+    bcrypt_hash = JwtHandler.get_password_hash("s3cret")
+
+    with mock.patch.object(jwt_utils, "PASSWORD_HASH_SCHEME", "argon2"):
+        hashed = JwtHandler.get_password_hash("s3cret")
+        assert hashed.startswith("$argon2")
+        assert JwtHandler.verify_password("s3cret", hashed)
+        assert JwtHandler.verify_password("wrong", hashed) is False
+
+        # Hashes stored before switching schemes keep verifying
+        assert JwtHandler.verify_password("s3cret", bcrypt_hash)
+        assert not JwtHandler.verify_password("wrong", bcrypt_hash)
+
+    # Without argon2-cffi, argon2 hashes cannot be verified
+    with mock.patch.object(jwt_utils, "argon2_hasher", None):
+        with pytest.raises(ValueError):
+            JwtHandler.verify_password("s3cret", hashed)
+
+
 def test_messages_class():
     """Test Messages class functionality"""
     from microservices_utils import Messages
@@ -103,6 +525,21 @@ def test_messages_class():
     message_200 = Messages.get_by_code(200, "Default message")
     assert message_200 == "Default message"  # 200 not in map
 
+    from microservices_utils import get_by_code
+    from microservices_utils.messages import user
+
+    assert get_by_code(404) == Messages.get_by_code(404)
+    assert user is Messages.user
+
+    assert Messages.from_value("Recurso no encontrado") is Messages.general.NOT_FOUND
+    assert Messages.from_value(Messages.text.user.USER_CREATED) is Messages.user.USER_CREATED
+    assert Messages.from_value("no existe") is None
+
+    # Plain str views of the catalogs
+    assert Messages.text.general.SUCCESS == Messages.general.SUCCESS.value
+    assert Messages.text.user.USER_CREATED == Messages.user.USER_CREATED.value
+    assert type(Messages.text.permission.PERMISSION_CREATED) is str
+
 
 if __name__ == "__main__":
     # Run basic import test if executed directly
@@ -112,15 +549,57 @@ if __name__ == "__main__":
     test_response_handler_functionality()
     print("✅ ResponseHandler functionality test passed!")
 
+    test_response_handler_from_result()
+    print("✅ ResponseHandler from_result test passed!")
+
+    test_response_handler_specialize()
+    print("✅ ResponseHandler specialize test passed!")
+
+    test_response_handler_json()
+    print("✅ ResponseHandler JSON test passed!")
+
     test_messages_enum()
     print("✅ Messages enum test passed!")
 
     test_logger_functionality()
     print("✅ Logger functionality test passed!")
 
+    test_logger_routing()
+    print("✅ Logger routing test passed!")
+
+    test_logger_permissions()
+    print("✅ Logger permissions test passed!")
+
+    test_logger_recreates_deleted_directory()
+    print("✅ Logger directory recreation test passed!")
+
+    test_logger_never_raises()
+    print("✅ Logger error handling test passed!")
+
+    test_logger_after_fork()
+    print("✅ Logger after fork test passed!")
+
     test_jwt_handler_functionality()
     print("✅ JwtHandler functionality test passed!")
 
+    test_messages_format()
+    print("✅ Messages format test passed!")
+
+    test_create_access_token_claims()
+    print("✅ Access token claims test passed!")
+
+    test_verify_token_cache()
+    print("✅ Token verification cache test passed!")
+
+    test_verify_token_es256()
+    print("✅ ES256 token verification test passed!")
+
+    test_password_hashing()
+    print("✅ Password hashing test passed!")
+
+    test_password_hashing_argon2()
+    print("✅ Argon2 password hashing test passed!")
+
     test_messages_class()
     print("✅ Messages class test passed!")
 